@@ -1,6 +1,139 @@
 """Functions to parse a file containing student data."""
 
+import functools
+import itertools
+import os
+import sys
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# Cohort codes that mark someone as a non-student. A frozenset gives the
+# `in` checks below a hashed O(1) probe instead of a tuple scan.
+_NON_STUDENTS = frozenset({"I", "G"})
+
+# Below this roster size, the overhead of spinning up a thread pool
+# costs more than sorting the rosters one after another.
+_PARALLEL_SORT_THRESHOLD = 5000
+
+# The cached file contents, stored column-wise: parallel tuples rather
+# than one tuple per person. Most queries only look at one or two
+# columns, so this lets them iterate exactly the data they need. The
+# last names get their own column so find_duped_last_names doesn't have
+# to carve them back out of the joined full names.
+_Columns = namedtuple(
+    "_Columns", ["fullnames", "lasts", "houses", "advisers", "cohorts"]
+)
+
+
+def _parse(filename):
+    """Yield one (full name, last, house, adviser, cohort) tuple per line."""
+
+    # Slurp the file with one bulk read and split it into lines in C,
+    # instead of letting the text layer decode and scan for newlines one
+    # line at a time. splitlines() handles \r\n uniformly and drops the
+    # trailing empty line. The cohort data is plain ASCII, so each line
+    # decodes with the cheaper "ascii" codec.
+    with open(filename, "rb") as cohort_data:
+        lines = cohort_data.read().splitlines()
+
+    for raw_line in lines:
+        # maxsplit=4 caps the split at the five known fields, so the
+        # splitter stops scanning once the cohort field starts.
+        first, last, house, adviser, cohort_name = raw_line.decode(
+            "ascii"
+        ).split("|", 4)
+
+        # Houses and cohorts come from a small fixed vocabulary, and
+        # every downstream query compares against literals (which the
+        # compiler interns). Interning the parsed fields too turns those
+        # comparisons into pointer checks. Plain concatenation beats an
+        # f-string for the name: no format machinery needed.
+        yield (
+            first + " " + last,
+            last,
+            sys.intern(house),
+            adviser,
+            sys.intern(cohort_name),
+        )
+
+
+@functools.lru_cache(maxsize=8)
+def _load(filename, mtime):
+    """Parse a data file once and cache it as a _Columns of four tuples.
+
+    `mtime` isn't used in the body --- it's part of the cache key, so an
+    edited file gets re-read instead of served stale. The columns are
+    stored as tuples (not lists) so cached data can't be mutated by
+    callers.
+    """
+
+    rows = list(_parse(filename))
+
+    # An empty file transposes into zero columns, not five empty ones,
+    # so it needs spelling out for _Columns.
+    if not rows:
+        return _Columns((), (), (), (), ())
+
+    # zip(*rows) transposes the row tuples into columns.
+    return _Columns(*(tuple(column) for column in zip(*rows)))
+
+
+def _columns(filename):
+    """Return the cached columns for a data file, re-reading if it changed."""
+
+    return _load(filename, os.path.getmtime(filename))
+
+
+@functools.lru_cache(maxsize=8)
+def _make_index(filename, mtime):
+    """Build a {full name: (house, adviser, cohort)} index for a data file.
+
+    Like `_load`, the `mtime` argument only serves as a cache-buster.
+    """
+
+    cols = _load(filename, mtime)
+
+    return dict(
+        zip(cols.fullnames, zip(cols.houses, cols.advisers, cols.cohorts))
+    )
+
+
+def _index(filename):
+    """Return the cached name index for a data file."""
+
+    return _make_index(filename, os.path.getmtime(filename))
+
+
+def _mtime_cached(func):
+    """Memoize a query function's finished result per data file.
+
+    The column cache already avoids re-parsing, but queries like
+    all_names_by_house still redo their sorting on every call. This
+    caches the final result keyed on (filename, args) and recomputes
+    only when the file's mtime changes. Repeat callers get the same
+    object back, so they shouldn't mutate it.
+    """
+
+    cache = {}
+
+    @functools.wraps(func)
+    def wrapper(filename, *args):
+        key = (filename, args)
+        mtime = os.path.getmtime(filename)
+        cached = cache.get(key)
+
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        result = func(filename, *args)
+        cache[key] = (mtime, result)
+
+        return result
 
+    return wrapper
+
+
+@_mtime_cached
 def all_houses(filename):
     """Return a set of all house names in the given file.
 
@@ -15,14 +148,13 @@ def all_houses(filename):
       - set[str]: a set of strings
     """
 
-    # We use a single underscore (_) as variable names below.
-    # This is a way to say, "Hey don't worry about this variable
-    # because we'll never use it --- we only care about `house`.
-    #
-    # Python doesn't handle underscores in a special way or anything ---
-    # it's still just a variable name.
+    # set() over the cached house column runs entirely in C --- no
+    # per-row Python-level unpacking or `if` test. Ghosts and
+    # instructors have an empty house, so discard "" after.
+    houses = set(_columns(filename).houses)
+    houses.discard("")
 
-    return {house for _, house, *_ in all_data(filename) if house}
+    return houses
 
 
 def students_by_cohort(filename, cohort="All"):
@@ -53,38 +185,29 @@ def students_by_cohort(filename, cohort="All"):
       - list[list]: a list of lists
     """
 
-    # We have a pretty difficult to understand, compound conditional
-    # expression inside of the for-loop below. It's good to avoid
-    # writing compound conditional expressions that aren't immediately
-    # understandable.
-    #
-    # We should attempt to tell a better "story" with our code. What
-    # we *want* to express is that, if `cohort` == `"All"`, then return
-    # all the students. Otherwise, filter the students by cohort.
-    #
-    # The problem is that instructors and ghosts are all mixed in with
-    # students. Let's tackle this problem *before* we filter (or not filter)
-    # the students by cohort.
-
-    # Create a list of students' full names and cohort names
-    student_data = [
-        (fullname, cohort_name)
-        for fullname, _, _, cohort_name in all_data(filename)
-        if cohort_name not in ("I", "G")  # Filter out instructors, ghosts
-    ]
+    # The I and G codes are cohorts, but never *student* cohorts ---
+    # asking for them by name must not leak instructors or ghosts.
+    if cohort in _NON_STUDENTS:
+        return []
+
+    cols = _columns(filename)
 
+    # Build a boolean mask over the cohort column, then gather the
+    # matching names from the fullname column with compress(). Only the
+    # two columns involved are ever touched.
     if cohort == "All":
-        return sorted([fullname for fullname, _ in student_data])
+        # Instructors and ghosts are mixed in with the students, so
+        # "all" still means filtering out the I and G cohort codes.
+        mask = (code not in _NON_STUDENTS for code in cols.cohorts)
     else:
-        return sorted(
-            [
-                fullname
-                for fullname, cohort_name in student_data
-                if cohort_name == cohort
-            ]
-        )
+        mask = (code == cohort for code in cols.cohorts)
+
+    # sorted() consumes the compress iterator directly, so the only list
+    # this function allocates is the sorted one it returns.
+    return sorted(itertools.compress(cols.fullnames, mask))
 
 
+@_mtime_cached
 def all_names_by_house(filename):
     """Return a list that contains rosters for all houses, ghosts, instructors.
 
@@ -116,45 +239,48 @@ def all_names_by_house(filename):
       - list[list]: a list of lists
     """
 
-    dumbledores_army = []
-    gryffindor = []
-    hufflepuff = []
-    ravenclaw = []
-    slytherin = []
+    # Bucket each person with a single dict lookup per row instead of
+    # walking an if/elif chain of house comparisons. The dicts map each
+    # house (or non-student cohort code) straight to its roster's bound
+    # `.append` method. Dicts remember insertion order, so iterating
+    # `houses.values()` gives us the rosters in the documented order.
+
+    houses = {
+        "Dumbledore's Army": [],
+        "Gryffindor": [],
+        "Hufflepuff": [],
+        "Ravenclaw": [],
+        "Slytherin": [],
+    }
     ghosts = []
     instructors = []
 
-    for fullname, house, _, cohort_name in all_data(filename):
-        # Sometimes it makes code easier for someone else to read
-        # and understand if we take care of the weird edge case
-        # of ghosts and instructors first before taking care
-        # of the normal case.
-        if not house:
-            if cohort_name == "G":
-                ghosts.append(fullname)
-            elif cohort_name == "I":
-                instructors.append(fullname)
-
-        if house == "Dumbledore's Army":
-            dumbledores_army.append(fullname)
-        elif house == "Gryffindor":
-            gryffindor.append(fullname)
-        elif house == "Hufflepuff":
-            hufflepuff.append(fullname)
-        elif house == "Ravenclaw":
-            ravenclaw.append(fullname)
-        elif house == "Slytherin":
-            slytherin.append(fullname)
-
-    return [
-        sorted(dumbledores_army),
-        sorted(gryffindor),
-        sorted(hufflepuff),
-        sorted(ravenclaw),
-        sorted(slytherin),
-        sorted(ghosts),
-        sorted(instructors),
-    ]
+    appenders = {house: roster.append for house, roster in houses.items()}
+    non_students = {"G": ghosts.append, "I": instructors.append}
+
+    cols = _columns(filename)
+
+    for fullname, house, cohort_name in zip(
+        cols.fullnames, cols.houses, cols.cohorts
+    ):
+        append = appenders.get(house)
+        if append is None:
+            # If the person doesn't have a house, they're a ghost or
+            # an instructor --- dispatch on the cohort code instead.
+            append = non_students.get(cohort_name)
+        if append is not None:
+            append(fullname)
+
+    rosters = list(houses.values()) + [ghosts, instructors]
+
+    # The seven sorts are independent of each other, so on a big enough
+    # file they can be fanned out to a thread pool. For classroom-sized
+    # files the pool costs more than it saves --- sort serially.
+    if max(map(len, rosters)) > _PARALLEL_SORT_THRESHOLD:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            return list(executor.map(sorted, rosters))
+
+    return [sorted(roster) for roster in rosters]
 
 
 def all_data(filename):
@@ -175,17 +301,10 @@ def all_data(filename):
     Return:
       - list[tuple]: a list of tuples
     """
-    with open(filename) as cohort_data:
-
-        # `line.rstrip().split("|")` returns a list. A more semantic data
-        # structure to use to represent rows of data is a tuple. So, let's
-        # actually have this function return a list of tuples instead of
-        # a list of lists.
 
-        data = [tuple(line.rstrip().split("|")) for line in cohort_data]
+    cols = _columns(filename)
 
-    # Here, `rest` means "the rest of the data"
-    return [(f"{first} {last}", *rest) for first, last, *rest in data]
+    return list(zip(cols.fullnames, cols.houses, cols.advisers, cols.cohorts))
 
 
 def get_cohort_for(filename, name):
@@ -209,11 +328,10 @@ def get_cohort_for(filename, name):
       - str: the person's cohort or None
     """
 
-    for full_name, _, _, cohort_name in all_data(filename):
-        if full_name == name:
-            return cohort_name
+    return _index(filename).get(name, (None, None, None))[2]
 
 
+@_mtime_cached
 def find_duped_last_names(filename):
     """Return a set of duplicated last names that exist in the data.
 
@@ -228,16 +346,12 @@ def find_duped_last_names(filename):
       - set[str]: a set of strings
     """
 
-    dupes = set()
+    # Counter tallies the cached last-name column in a single
+    # C-implemented pass --- no per-row splitting of full names, and no
+    # membership-probe-then-add dance with two sets.
+    last_names = Counter(_columns(filename).lasts)
 
-    seen_names = set()
-    for first, last, *_ in read_cohort_data(filename):
-        if last in seen_names:
-            dupes.add(last)
-
-        seen_names.add(last)
-
-    return dupes
+    return {last for last, count in last_names.items() if count > 1}
 
 
 # Helper function that returns a student's house
@@ -246,9 +360,7 @@ def find_duped_last_names(filename):
 def get_house_for(filename, name):
     """Return house of student with `name`."""
 
-    for fullname, house, *_ in all_data(filename):
-        if fullname == name:
-            return house
+    return _index(filename).get(name, (None, None, None))[0]
 
 
 def get_housemates_for(filename, name):
@@ -263,15 +375,25 @@ def get_housemates_for(filename, name):
     {'Angelina Johnson', ..., 'Seamus Finnigan'}
     """
 
-    target_cohort = get_cohort_for(filename, name)
-    target_house = get_house_for(filename, name)
+    # The index gives us the target's house and cohort in O(1), so the
+    # only scan left is the one that collects the housemates themselves.
+    target = _index(filename).get(name)
+
+    if target is None:
+        return set()
+
+    target_house, _, target_cohort = target
+
+    cols = _columns(filename)
 
     return {
-        full_name
-        for full_name, house, _, cohort_name in all_data(filename)
-        if full_name != name
-        and house == target_house
+        fullname
+        for fullname, house, cohort_name in zip(
+            cols.fullnames, cols.houses, cols.cohorts
+        )
+        if house == target_house
         and cohort_name == target_cohort
+        and fullname != name
     }
 
 